@@ -234,19 +234,21 @@ def is_data_in_hdf5(path_hdf5: Union[str, Path], xs: Union[str, List[str]]) -> b
 @overload
 def store_arrays_in_hdf5(
         path_hdf5: PathLike, paths: str, tensor: np.ndarray,
-        dtype: float = np.float32, attribute: Union[BasisFormats, None] = None) -> None:
+        dtype: float = np.float32, attribute: Union[BasisFormats, None] = None,
+        compression: Union[str, None] = None) -> None:
     ...
 
 
 @overload
 def store_arrays_in_hdf5(
     path_hdf5: PathLike, paths: List[str], tensor: np.ndarray,
-        dtype: float = np.float32, attribute: Union[BasisFormats, None] = None) -> None:
+        dtype: float = np.float32, attribute: Union[BasisFormats, None] = None,
+        compression: Union[str, None] = None) -> None:
     ...
 
 
 def store_arrays_in_hdf5(
-        path_hdf5, paths, tensor, dtype=np.float32, attribute=None):
+        path_hdf5, paths, tensor, dtype=np.float32, attribute=None, compression=None):
     """Store a tensor in the HDF5.
 
     Parameters
@@ -261,9 +263,16 @@ def store_arrays_in_hdf5(
         Data type use to store the numerical array
     attribute
         Attribute associated with the tensor
+    compression
+        Filter used to compress the data, e.g. ``'lzf'``. Compressed data is stored in chunks.
+        Scalars cannot be chunked, so they are always stored uncompressed
 
     """
     path_hdf5 = path_to_posix(path_hdf5)
+    options = {} if compression is None else {'compression': compression, 'shuffle': True}
+
+    def filter_options(data) -> Dict[str, Any]:
+        return options if np.ndim(data) > 0 else {}
 
     def add_attribute(data_set, k: int = 0):
         if attribute is not None:
@@ -274,11 +283,11 @@ def store_arrays_in_hdf5(
             for k, path in enumerate(paths):
                 data = tensor[k]
                 dset = f5.require_dataset(path, shape=np.shape(data),
-                                          data=data, dtype=dtype)
+                                          data=data, dtype=dtype, **filter_options(data))
                 add_attribute(dset, k)
         else:
             dset = f5.require_dataset(paths, shape=np.shape(
-                tensor), data=tensor, dtype=dtype)
+                tensor), data=tensor, dtype=dtype, **filter_options(tensor))
             add_attribute(dset)
 
 
@@ -8,11 +8,13 @@ Index
 .. currentmodule:: nanoqm.integrals.multipole_matrices
 .. autosummary::
     get_multipole_matrix
+    get_multipole_matrices
     compute_matrix_multipole
 
 API
 ---
 .. autofunction:: get_multipole_matrix
+.. autofunction:: get_multipole_matrices
 .. autofunction:: compute_matrix_multipole
 """
 import logging
@@ -20,17 +22,25 @@ import os
 import uuid
 from os.path import join
 from pathlib import Path
-from typing import List, Optional, Union
+from typing import Dict, List, Optional, Union
 
+import h5py
 import numpy as np
 from compute_integrals import compute_integrals_multipole
 from qmflows.common import AtomXYZ
 
-from ..common import (DictConfig, Matrix, is_data_in_hdf5, retrieve_hdf5_data,
-                      store_arrays_in_hdf5, tuplesXYZ_to_plams)
+from ..common import (DictConfig, Matrix, path_to_posix, store_arrays_in_hdf5,
+                      tuplesXYZ_to_plams)
 
 logger = logging.getLogger(__name__)
 
+#: Number of matrices computed for each multipole: the overlap + {x, y, z} dipole
+#: matrices, plus the {xx, xy, xz, yy, yz, zz} quadrupole matrices
+multipole_components = {'dipole': 4, 'quadrupole': 10}
+
+#: Number of matrices of each multipole tensor, including the overlap
+multipole_order = {'overlap': 1, **multipole_components}
+
 
 def get_multipole_matrix(config: DictConfig, inp: DictConfig, multipole: str) -> Matrix:
     """Retrieve the `multipole` number `i` from the trajectory. Otherwise compute it.
@@ -49,29 +59,88 @@ def get_multipole_matrix(config: DictConfig, inp: DictConfig, multipole: str) ->
     np.ndarray
         Tensor containing the multipole.
 
+    """
+    return get_multipole_matrices(config, inp, [multipole])[multipole]
+
+
+def get_multipole_matrices(
+        config: DictConfig, inp: DictConfig, multipoles: List[str]) -> Dict[str, Matrix]:
+    """Retrieve several `multipoles` for the point `i` of the trajectory.
+
+    The stored multipoles are read using a single HDF5 handle and the missing ones are
+    computed and stored together. Since the quadrupole tensor contains the overlap and
+    dipole matrices, the lower multipoles are sliced from the highest computed one.
+
+    Parameters
+    ----------
+    config
+        Global configuration to run a workflow
+    inp
+        Information about the current point, e.g. molecular geometry.
+    multipoles
+        Any of overlap, dipole or quadrupole.
+
+    Returns
+    -------
+    dict
+        Tensor containing each multipole.
+
     """
     point = f'point_{inp.i + config.enumerate_from}'
     path_hdf5 = config.path_hdf5
-    path_multipole_hdf5 = join(config.orbitals_type, multipole, point)
-    matrix_multipole = search_multipole_in_hdf5(
-        path_hdf5, path_multipole_hdf5, multipole)
+    paths = {m: join(config.orbitals_type, m, point) for m in multipoles}
+    matrices = search_multipoles_in_hdf5(path_hdf5, paths)
+
+    # Compute the highest missing multipole first, so the lower ones can be sliced from it
+    missing = sorted((m for m in paths if m not in matrices),
+                     key=lambda m: multipole_order.get(m, 0), reverse=True)
+    if missing:
+        logger.info(f"computing multipoles: {', '.join(missing)}")
+        computed: Dict[str, Matrix] = {}
+        for m in missing:
+            matrix = slice_lower_multipole(computed, m)
+            if matrix is None:
+                matrix = compute_matrix_multipole(inp.mol, config, m)
+            computed[m] = matrices[m] = matrix
+
+        store_arrays_in_hdf5(
+            path_hdf5, [paths[m] for m in missing], [matrices[m] for m in missing],
+            compression='lzf')
+
+    return matrices
+
+
+def slice_lower_multipole(computed: Dict[str, Matrix], multipole: str) -> Optional[Matrix]:
+    """Slice `multipole` from an already `computed` higher multipole tensor, if there is one."""
+    for name, tensor in computed.items():
+        if name not in multipole_components:
+            continue
+        elif multipole == 'overlap':
+            return tensor[0]
+        elif multipole in multipole_components and \
+                multipole_components[multipole] < multipole_components[name]:
+            return tensor[:multipole_components[multipole]]
 
-    if matrix_multipole is None:
-        matrix_multipole = compute_matrix_multipole(inp.mol, config, multipole)
-        store_arrays_in_hdf5(path_hdf5, path_multipole_hdf5, matrix_multipole)
+    return None
 
-    return matrix_multipole
 
+def search_multipoles_in_hdf5(
+        path_hdf5: Union[str, Path], paths: Dict[str, str]) -> Dict[str, np.ndarray]:
+    """Search which of the multipoles in `paths` are already stored in the HDF5 and read them.
 
-def search_multipole_in_hdf5(
-        path_hdf5: Union[str, Path], path_multipole_hdf5: str, multipole: str) -> Optional[np.ndarray]:
-    """Search if the multipole is already store in the HDF5."""
-    if is_data_in_hdf5(path_hdf5, path_multipole_hdf5):
-        logger.info(f"retrieving multipole: {multipole} from the hdf5")
-        return retrieve_hdf5_data(path_hdf5, path_multipole_hdf5)
+    The lookups and the reads share a single file handle.
+    """
+    matrices = {}
+    path_hdf5 = path_to_posix(path_hdf5)
+    if os.path.exists(path_hdf5):
+        with h5py.File(path_hdf5, 'r') as f5:
+            for multipole, path in paths.items():
+                dset = f5.get(path)
+                if dset is not None:
+                    logger.info(f"retrieving multipole: {multipole} from the hdf5")
+                    matrices[multipole] = dset[()]
 
-    logger.info(f"computing multipole: {multipole}")
-    return None
+    return matrices
 
 
 def compute_matrix_multipole(
@@ -108,27 +177,14 @@ def compute_matrix_multipole(
     # name of the basis set
     basis_name = config["cp2k_general_settings"]["basis"]
 
-    if multipole == 'overlap':
-        matrix_multipole = compute_integrals_multipole(
-            path, path_hdf5, basis_name, multipole)
-    elif multipole == 'dipole':
-        # The tensor contains the overlap + {x, y, z} dipole matrices
-        super_matrix = compute_integrals_multipole(
-            path, path_hdf5, basis_name, multipole)
-        dim = super_matrix.shape[1]
-
-        # Reshape the super_matrix as a tensor containing overlap + {x, y, z} dipole matrices
-        matrix_multipole = super_matrix.reshape(4, dim, dim)
-
-    elif multipole == 'quadrupole':
-        # The tensor contains the overlap + {xx, xy, xz, yy, yz, zz} quadrupole matrices
-        print("super_matrix: ", path, path_hdf5, basis_name, multipole)
-        super_matrix = compute_integrals_multipole(
-            path, path_hdf5, basis_name, multipole)
-        dim = super_matrix.shape[1]
-
-        # Reshape to 3d tensor containing overlap + {x, y, z} + {xx, xy, xz, yy, yz, zz} quadrupole matrices
-        matrix_multipole = super_matrix.reshape(10, dim, dim)
+    # For the dipole and quadrupole, libint computes all the components in a single call
+    matrix_multipole = compute_integrals_multipole(
+        path, path_hdf5, basis_name, multipole)
+
+    if multipole in multipole_components:
+        # Reshape the super_matrix as a tensor with the components stacked along the 0-axis
+        dim = matrix_multipole.shape[1]
+        matrix_multipole = matrix_multipole.reshape(multipole_components[multipole], dim, dim)
 
     # Delete the tmp molecule file
     os.remove(path)
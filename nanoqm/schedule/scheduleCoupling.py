@@ -378,8 +378,7 @@ def single_machine_overlaps(
 
 def create_overlap_path(config: DictConfig, i: int) -> str:
     """Create the path inside the HDF5 where the overlap is going to be store."""
-    root = join(config.orbitals_type, 'overlaps_{}'.format(
-        i + config.enumerate_from))
+    root = join(config.orbitals_type, f'overlaps_{i + config.enumerate_from}')
     return join(root, 'mtx_sji_t0')
 
 
@@ -13,9 +13,10 @@ API
 import logging
 import os
 import warnings
+from collections import Counter
 from os.path import join
 from pathlib import Path
-from typing import Any, Dict, Union
+from typing import Any, Dict, Optional, Union
 
 import yaml
 from schema import SchemaError
@@ -34,6 +35,12 @@ from .schemas import (schema_absorption_spectrum, schema_coop,
                       schema_single_points)
 from .templates import create_settings_from_template, valence_electrons
 
+# Use the fast C-based dumper if possible
+try:
+    from yaml import CSafeDumper as SafeDumper
+except ImportError:
+    from yaml import SafeDumper  # type: ignore[misc]
+
 logger = logging.getLogger(__name__)
 
 
@@ -50,7 +57,8 @@ schema_workflows = {
 }
 
 
-def process_input(input_file: PathLike, workflow_name: str) -> DictConfig:
+def process_input(
+        input_file: PathLike, workflow_name: str, validate: Optional[bool] = None) -> DictConfig:
     """Read the `input_file` in YAML format and validate it.
 
     Use the corresponding `workflow_name` schema and return a nested
@@ -60,6 +68,14 @@ def process_input(input_file: PathLike, workflow_name: str) -> DictConfig:
     ----------
     input_file
         path to the input
+    workflow_name
+        name of the workflow to run
+    validate
+        whether to validate the input against the workflow schema. If ``None``
+        the validation is skipped only if the ``NANOQM_SKIP_SCHEMA`` environment
+        variable is set to ``1``. Skipping the validation is only meant for
+        trusted inputs containing all the keywords, like the ``input_parameters.yml``
+        file written by a previous run.
 
     Returns
     -------
@@ -73,8 +89,15 @@ def process_input(input_file: PathLike, workflow_name: str) -> DictConfig:
     """
     schema = schema_workflows[workflow_name]
 
+    if validate is None:
+        validate = os.environ.get("NANOQM_SKIP_SCHEMA", "0") != "1"
+
     with open(input_file, 'r') as f:
-        dict_input = yaml.load(f.read(), Loader=UniqueSafeLoader)
+        dict_input = yaml.load(f, Loader=UniqueSafeLoader)
+
+    if not validate:
+        logger.info(f"skipping the validation of: {input_file}")
+        return DictConfig(InputSanitizer(dict_input).sanitize())
 
     try:
         d = schema.validate(dict_input)
@@ -99,7 +122,6 @@ class InputSanitizer:
         self.create_settings()
         self.apply_templates()
         self.add_missing_keywords()
-        self.add_executable()
         self.print_final_input()
 
         return self.user_input
@@ -124,11 +146,6 @@ class InputSanitizer:
                 # Add other keywords
                 s['specific'] = cp2k_template.overlay(s['specific'])
 
-    def add_executable(self) -> None:
-        """Add executable to the job settings."""
-        self.general['cp2k_settings_main']['executable'] = self.general['executable']
-        self.general['cp2k_settings_guess']['executable'] = self.general['executable']
-
     def add_missing_keywords(self) -> None:
         """Add missing input data using the defaults."""
         # Add the `added_mos` and `mo_index_range` keywords
@@ -144,20 +161,16 @@ class InputSanitizer:
         # Add restart point provided by the user
         self.add_restart_point()
 
-        # Add basis sets
-        self.add_basis()
-
-        # add cell parameters
-        self.add_cell_parameters()
-
-        # Add Periodic properties
-        self.add_periodic()
-
-        # Add charge
-        self.add_charge()
+        # Resolve the path to the basis and potential files only once
+        path_basis = self.general["path_basis"]
+        if path_basis is not None:
+            logger.info("path to basis added to cp2k settings")
+            path_basis = os.path.abspath(path_basis)
 
-        # Add multiplicity
-        self.add_multiplicity()
+        # Add the system keywords to both the main and the guess settings
+        setts = (self.general['cp2k_settings_main'], self.general['cp2k_settings_guess'])
+        for sett in setts:
+            self.populate_settings(sett, path_basis)
 
     def compute_homo_index(self) -> int:
         """Compute the HOMO index."""
@@ -165,8 +178,10 @@ class InputSanitizer:
         charge = self.general['charge']
         mol = Molecule(self.user_input["path_traj_xyz"], 'xyz')
 
+        # Look up the valence electrons once per element
+        counts = Counter(at.symbol for at in mol.atoms)
         number_of_electrons = sum(
-            valence_electrons['-'.join((at.symbol, basis))] for at in mol.atoms)
+            n * valence_electrons[f"{symbol}-{basis}"] for symbol, n in counts.items())
 
         # Correct for total charge of the system
         number_of_electrons = number_of_electrons - charge
@@ -177,72 +192,53 @@ class InputSanitizer:
 
         return (number_of_electrons // 2) + (number_of_electrons % 2)
 
-    def add_basis(self) -> None:
-        """Add path to the basis and potential."""
-        setts = [self.general[p] for p in ['cp2k_settings_main', 'cp2k_settings_guess']]
+    def populate_settings(self, sett: Settings, path_basis: Optional[str]) -> None:
+        """Add the basis, cell, periodicity, charge, multiplicity and executable to `sett`.
+
+        `path_basis` is the absolute path to the folder with the basis and potential files.
+        """
+        g = self.general
+        force_eval = sett.specific.cp2k.force_eval
+        dft = force_eval.dft
 
         # add basis and potential path
-        if self.general["path_basis"] is not None:
-            logger.info("path to basis added to cp2k settings")
-            for x in setts:
-                x.basis = self.general['basis']
-                x.potential = self.general['potential']
-                x.specific.cp2k.force_eval.dft.potential_file_name = os.path.abspath(
-                    join(self.general['path_basis'], "GTH_POTENTIALS"))
+        if path_basis is not None:
+            sett.basis = g['basis']
+            sett.potential = g['potential']
+            dft.potential_file_name = join(path_basis, "GTH_POTENTIALS")
+
+            # Choose the file basis to use
+            self.select_basis_file(sett, path_basis)
+
+        # Search for a file containing the cell parameters
+        if g["file_cell_parameters"] is None:
+            sett.cell_parameters = g['cell_parameters']
+        else:
+            sett.cell_parameters = None
+        sett.cell_angles = None
+
+        # Periodicity and charge of the system
+        force_eval.subsys.cell.periodic = g['periodic']
+        dft.charge = g['charge']
 
-                # Choose the file basis to use
-                self.select_basis_file(x)
+        # Multiplicity only if greater than 1
+        if g['multiplicity'] > 1:
+            dft.multiplicity = g['multiplicity']
+            dft.uks = ""
 
-    def select_basis_file(self, sett: Settings) -> None:
+        # Executable to run the job
+        sett.executable = g['executable']
+
+    def select_basis_file(self, sett: Settings, path_basis: str) -> None:
         """Choose the right basis set based on the potential and basis name."""
         dft = sett.specific.cp2k.force_eval.dft
 
-        dft["basis_set_file_name"] = [os.path.abspath(
-            join(self.general['path_basis'], "BASIS_MOLOPT"))]
+        dft["basis_set_file_name"] = [join(path_basis, "BASIS_MOLOPT")]
 
         if dft.xc.get("xc_functional pbe") is None:
             # USE ADMM
-            dft["basis_set_file_name"].append(os.path.abspath(
-                join(self.general['path_basis'], "BASIS_ADMM_MOLOPT")))
-            dft["basis_set_file_name"].append(os.path.abspath(
-                join(self.general['path_basis'], "BASIS_ADMM")))
-
-    def add_cell_parameters(self) -> None:
-        """Add the Unit cell information to both the main and the guess settings."""
-        # Search for a file containing the cell parameters
-        for s in (self.general[p] for p in [
-                'cp2k_settings_main',
-                'cp2k_settings_guess']):
-            if self.general["file_cell_parameters"] is None:
-                s.cell_parameters = self.general['cell_parameters']
-                s.cell_angles = None
-            else:
-                s.cell_parameters = None
-            s.cell_angles = None
-
-    def add_periodic(self) -> None:
-        """Add the keyword for the periodicity of the system."""
-        for s in (
-            self.general[p] for p in [
-                'cp2k_settings_main',
-                'cp2k_settings_guess']):
-            s.specific.cp2k.force_eval.subsys.cell.periodic = self.general['periodic']
-
-    def add_charge(self) -> None:
-        """Add the keyword for the charge of the system."""
-        for s in (
-            self.general[p] for p in [
-                'cp2k_settings_main',
-                'cp2k_settings_guess']):
-            s.specific.cp2k.force_eval.dft.charge = self.general['charge']
-
-    def add_multiplicity(self) -> None:
-        """Add the keyword for the multiplicity of the system only if greater than 1."""
-        if self.general['multiplicity'] > 1:
-            for s in (
-                    self.general[p] for p in ('cp2k_settings_main', 'cp2k_settings_guess')):
-                s.specific.cp2k.force_eval.dft.multiplicity = self.general['multiplicity']
-                s.specific.cp2k.force_eval.dft.uks = ""
+            dft["basis_set_file_name"].append(join(path_basis, "BASIS_ADMM_MOLOPT"))
+            dft["basis_set_file_name"].append(join(path_basis, "BASIS_ADMM"))
 
     def add_restart_point(self) -> None:
         """Add a restart file if the user provided it."""
@@ -260,16 +256,14 @@ class InputSanitizer:
         self.user_input["mo_index_range"] = mo_index_range
 
         # mo_index_range keyword
-        cp2k_main = self.general['cp2k_settings_main']
-        dft_main_print = cp2k_main.specific.cp2k.force_eval.dft.print
-        dft_main_print.mo.mo_index_range = "{} {}".format(
-            mo_index_range[0] + 1, mo_index_range[1])
+        dft = self.general['cp2k_settings_main'].specific.cp2k.force_eval.dft
+        mo = dft.print.mo
+        mo.mo_index_range = f"{mo_index_range[0] + 1} {mo_index_range[1]}"
 
         # added_mos
-        cp2k_main.specific.cp2k.force_eval.dft.scf.added_mos = mo_index_range[1] - nHOMO
+        dft.scf.added_mos = mo_index_range[1] - nHOMO
 
         # Add section to Print the orbitals
-        mo = cp2k_main.specific.cp2k.force_eval.dft.print.mo
         mo.add_last = "numeric"
         mo.each.qs_scf = 0
         mo.eigenvalues = ""
@@ -277,22 +271,42 @@ class InputSanitizer:
         mo.ndigits = 36
 
     def print_final_input(self) -> None:
-        """Print the input after post-processing."""
-        xs = self.user_input.copy()
+        """Print the input after post-processing.
+
+        The file is not written if the ``NANOQM_WRITE_INPUT_YML`` environment
+        variable is set to ``0``.
+        """
+        if os.environ.get("NANOQM_WRITE_INPUT_YML", "1") == "0":
+            return
 
-        for k, v in self.user_input.items():
-            xs[k] = recursive_traverse(v)
+        xs = {k: recursive_traverse(v) for k, v in self.user_input.items()}
 
         with open("input_parameters.yml", "w") as f:
-            yaml.dump(xs, f, indent=4)
+            yaml.dump(xs, f, indent=4, Dumper=SafeDumper)
 
 
 def recursive_traverse(val: Union[Dict, Settings, Any]) -> Union[Dict, Settings, Any]:
-    """Check if the value of a key is a Settings instance a transform it to plain dict."""
-    if isinstance(val, dict):
-        if isinstance(val, Settings):
-            return val.as_dict()
-        else:
-            return {k: recursive_traverse(v) for k, v in val.items()}
-    else:
+    """Check if the value of a key is a Settings instance a transform it to plain dict.
+
+    Nested dictionaries are walked using an explicit stack instead of recursive calls.
+    """
+    # Settings is a subclass of dict, so it must be checked first
+    if isinstance(val, Settings):
+        return val.as_dict()
+    elif not isinstance(val, dict):
         return val
+
+    root: Dict = {}
+    stack = [(root, val)]
+    while stack:
+        new, old = stack.pop()
+        for k, v in old.items():
+            if isinstance(v, Settings):
+                new[k] = v.as_dict()
+            elif isinstance(v, dict):
+                new[k] = {}
+                stack.append((new[k], v))
+            else:
+                new[k] = v
+
+    return root
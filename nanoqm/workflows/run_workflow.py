@@ -2,7 +2,7 @@
 """Comman line interface to run the workflows.
 
 Usage:
-    run_workflow.py -i input.yml
+    run_workflow.py -i input.yml [--no-schema-validation]
 
 Available workflow:
     * absorption_spectrum
@@ -34,6 +34,8 @@ msg = "run_workflow.py -i input.yml"
 parser = argparse.ArgumentParser(description=msg)
 parser.add_argument('-i', required=True,
                     help="Input file in YAML format")
+parser.add_argument('--no-schema-validation', action='store_true',
+                    help="Skip the validation of a trusted input, e.g. input_parameters.yml")
 
 
 dict_workflows = {
@@ -57,7 +59,8 @@ def main():
         workflow_name = dict_input['workflow']
 
     # Read and process input
-    inp = process_input(input_file, workflow_name)
+    validate = False if args.no_schema_validation else None
+    inp = process_input(input_file, workflow_name, validate=validate)
 
     # run workflow
     function = dict_workflows[workflow_name]
@@ -2,6 +2,7 @@
 
 import argparse
 from pathlib import Path
+from unittest.mock import MagicMock
 
 import pytest
 import yaml
@@ -12,16 +13,21 @@ from pytest_mock import MockFixture
 from .utilsTest import PATH_TEST
 
 
-def call_main(mocker: MockFixture, path_input: Path, scratch_path: Path):
-    """Mock main function."""
+def call_main(
+        mocker: MockFixture, path_input: Path, scratch_path: Path,
+        no_schema_validation: bool = False) -> MagicMock:
+    """Mock main function and return the mocked `process_input`."""
     # Mock argparse
     mocker.patch("argparse.ArgumentParser.parse_args", return_value=argparse.Namespace(
-        i=path_input))
+        i=path_input, no_schema_validation=no_schema_validation))
 
-    mocker.patch("nanoqm.workflows.run_workflow.process_input", return_value={})
+    process_input = mocker.patch(
+        "nanoqm.workflows.run_workflow.process_input", return_value={})
     mocker.patch("nanoqm.workflows.run_workflow.dict_workflows", return_value=len)
     main()
 
+    return process_input
+
 
 def test_run_workflow(mocker: MockFixture, tmp_path: Path):
     """Test that the CLI main command is called correctly."""
@@ -29,6 +35,14 @@ def test_run_workflow(mocker: MockFixture, tmp_path: Path):
     call_main(mocker, path_input, tmp_path)
 
 
+def test_run_workflow_no_schema_validation(mocker: MockFixture, tmp_path: Path):
+    """Check that the schema validation can be skipped from the command line."""
+    path_input = PATH_TEST / "input_fast_test_derivative_couplings.yml"
+    process_input = call_main(mocker, path_input, tmp_path, no_schema_validation=True)
+
+    assert process_input.call_args.kwargs["validate"] is False
+
+
 def test_run_workflow_no_workflow(mocker: MockFixture, tmp_path: Path):
     """Check that an error is raised if not workflow is provided."""
     # remove workflow keyword
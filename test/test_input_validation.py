@@ -1,5 +1,8 @@
 """Test input validation functionality."""
+from pathlib import Path
+
 import pytest
+import yaml
 from qmflows import cp2k, run
 from qmflows.type_hints import PathLike
 from scm import plams
@@ -7,7 +10,21 @@ from scm import plams
 from nanoqm.common import read_cell_parameters_as_array
 from nanoqm.workflows.input_validation import process_input
 
-from .utilsTest import PATH_TEST, cp2k_available, remove_files
+from .utilsTest import PATH_TEST, ROOT, cp2k_available, remove_files
+
+
+def write_input_with_absolute_paths(path_input: PathLike, tmp_path: Path) -> Path:
+    """Copy `path_input` to `tmp_path` replacing the relative paths by absolute ones."""
+    with open(path_input, 'r') as f:
+        dict_input = yaml.safe_load(f)
+    for key in ("path_hdf5", "path_traj_xyz"):
+        dict_input[key] = (ROOT / dict_input[key]).as_posix()
+
+    path_copy = tmp_path / Path(path_input).name
+    with open(path_copy, 'w') as f:
+        yaml.safe_dump(dict_input, f)
+
+    return path_copy
 
 
 def test_input_validation() -> None:
@@ -21,6 +38,38 @@ def test_input_validation() -> None:
     assert abs(scale_x - 0.75) < 1e-16
 
 
+def test_skip_validation(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    """Check that the sanitized input can be reused without validating it again."""
+    path_input = write_input_with_absolute_paths(PATH_TEST / "input_test_pbe0.yml", tmp_path)
+    monkeypatch.chdir(tmp_path)
+    process_input(path_input, "derivative_couplings")
+
+    monkeypatch.setenv("NANOQM_SKIP_SCHEMA", "1")
+    dict_input = process_input(tmp_path / "input_parameters.yml", "derivative_couplings")
+    sett = dict_input['cp2k_general_settings']['cp2k_settings_guess']
+
+    scale_x = sett.specific.cp2k.force_eval.dft.xc.xc_functional.pbe.scale_x
+
+    assert abs(scale_x - 0.75) < 1e-16
+
+
+def test_skip_validation_unknown_workflow() -> None:
+    """Check that an unknown workflow is rejected even if the validation is skipped."""
+    with pytest.raises(KeyError):
+        process_input(PATH_TEST / "input_test_pbe0.yml", "unknown_workflow", validate=False)
+
+
+def test_no_input_parameters_file(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    """Check that the final input is not written if the user does not want it."""
+    path_input = write_input_with_absolute_paths(PATH_TEST / "input_test_pbe0.yml", tmp_path)
+    monkeypatch.chdir(tmp_path)
+
+    monkeypatch.setenv("NANOQM_WRITE_INPUT_YML", "0")
+    process_input(path_input, "derivative_couplings")
+
+    assert not (tmp_path / "input_parameters.yml").exists()
+
+
 @pytest.mark.skipif(
     not cp2k_available(), reason="CP2K is not install or not loaded")
 def test_call_cp2k_pbe() -> None:
@@ -3,9 +3,13 @@
 import shutil
 from pathlib import Path
 
+import h5py
 import numpy as np
+import pytest
 from assertionlib import assertion
-from nanoqm.integrals.multipole_matrices import compute_matrix_multipole
+from nanoqm.common import DictConfig
+from nanoqm.integrals.multipole_matrices import (compute_matrix_multipole,
+                                                 get_multipole_matrices)
 from nanoqm.workflows.input_validation import process_input
 from qmflows.parsers.xyzParser import readXYZ
 
@@ -31,3 +35,48 @@ def test_quadropole(tmp_path):
     for i in range(10):
         arr = matrix[i].reshape(46, 46)
         assertion.truth(np.allclose(arr, arr.T))
+
+
+def test_multipole_matrices(tmp_path):
+    """Test that the lower multipoles sliced from the quadrupole match libint's."""
+    file_path = PATH_TEST / "input_test_single_points.yml"
+    config = process_input(file_path, 'single_points')
+    path_test_hdf5 = (Path(tmp_path) / "multipoles.hdf5").as_posix()
+    shutil.copyfile(config.path_hdf5, path_test_hdf5)
+    config.path_hdf5 = path_test_hdf5
+    config.scratch_path = tmp_path
+
+    mol = readXYZ((PATH_TEST / "ethylene.xyz").as_posix())
+    inp = DictConfig({'i': 0, 'mol': mol})
+    multipoles = ['overlap', 'dipole', 'quadrupole']
+    matrices = get_multipole_matrices(config, inp, multipoles)
+    assertion.shape_eq(matrices['overlap'], (46, 46))
+    assertion.shape_eq(matrices['dipole'], (4, 46, 46))
+    for name in ('overlap', 'dipole'):
+        expected = compute_matrix_multipole(mol, config, name)
+        assertion.truth(np.allclose(matrices[name], expected))
+
+    # The multipoles are stored compressed
+    with h5py.File(path_test_hdf5, 'r') as f5:
+        for name in multipoles:
+            assertion.eq(f5[f"{name}/point_0"].compression, 'lzf')
+
+    # The second call reads all the multipoles from the HDF5
+    stored = get_multipole_matrices(config, inp, multipoles)
+    for name in multipoles:
+        assertion.truth(np.allclose(stored[name], matrices[name], atol=1e-6))
+
+
+def test_unknown_multipole(tmp_path):
+    """Test that an unknown multipole is not sliced from a known one."""
+    file_path = PATH_TEST / "input_test_single_points.yml"
+    config = process_input(file_path, 'single_points')
+    path_test_hdf5 = (Path(tmp_path) / "multipoles.hdf5").as_posix()
+    shutil.copyfile(config.path_hdf5, path_test_hdf5)
+    config.path_hdf5 = path_test_hdf5
+    config.scratch_path = tmp_path
+
+    mol = readXYZ((PATH_TEST / "ethylene.xyz").as_posix())
+    inp = DictConfig({'i': 0, 'mol': mol})
+    with pytest.raises(RuntimeError):
+        get_multipole_matrices(config, inp, ['quadrupole', 'octupole'])
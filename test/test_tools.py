@@ -1,8 +1,12 @@
 """Test the workflows tools."""
+from pathlib import Path
+
+import h5py
 import numpy as np
 from qmflows.parsers import parse_string_xyz
 
-from nanoqm.common import number_spherical_functions_per_atom
+from nanoqm.common import (number_spherical_functions_per_atom,
+                           retrieve_hdf5_data, store_arrays_in_hdf5)
 
 from .utilsTest import PATH_TEST
 
@@ -18,3 +22,20 @@ def test_calc_sphericals():
     expected = np.concatenate((np.repeat(25, 33), np.repeat(13, 33)))
 
     assert np.array_equal(xs, expected)
+
+
+def test_store_compressed_arrays(tmp_path: Path):
+    """Test that arrays are compressed while scalars are stored as they are."""
+    path_hdf5 = tmp_path / "compressed.hdf5"
+    h5py.File(path_hdf5, 'w').close()
+
+    matrix = np.random.rand(4, 10, 10)
+    store_arrays_in_hdf5(path_hdf5, ["matrix", "scalar"], [matrix, 3.0], compression='lzf')
+
+    with h5py.File(path_hdf5, 'r') as f5:
+        assert f5["matrix"].compression == 'lzf'
+        assert f5["matrix"].shuffle
+        assert f5["scalar"].compression is None
+
+    assert np.allclose(retrieve_hdf5_data(path_hdf5, "matrix"), matrix)
+    assert retrieve_hdf5_data(path_hdf5, "scalar") == 3.0
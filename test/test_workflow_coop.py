@@ -1,7 +1,6 @@
 """Test the COOP workflow."""
 import os
 import shutil
-import sys
 from os.path import join
 
 from qmflows.type_hints import PathLike
@@ -22,10 +21,5 @@ def test_workflow_coop(tmp_path: PathLike) -> None:
     shutil.copy(config.path_hdf5, tmp_path)
     config.path_hdf5 = join(tmp_path, "Cd33Se33.hdf5")
     config.workdir = tmp_path
-    try:
-        workflow_crystal_orbital_overlap_population(config)
-        os.remove("COOP.txt")
-    except BaseException:
-        print("scratch_path: ", tmp_path)
-        print("Unexpected error:", sys.exc_info()[0])
-        raise
+    workflow_crystal_orbital_overlap_population(config)
+    os.remove("COOP.txt")